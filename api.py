@@ -1,29 +1,82 @@
-from flask import Flask, jsonify
-import json
+from flask import Flask, Response, jsonify, stream_with_context
+from flask.json.provider import JSONProvider
+import orjson
+import os
+import threading
+
+
+class OrJSONProvider(JSONProvider):
+    """
+    JSON-провайдер для Flask на основі orjson.
+
+    Серіалізація через orjson у 2-3 рази швидша за стандартний json
+    і не потребує проміжного перекодування в UTF-8.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
+app.json = OrJSONProvider(app)
+app.config['JSONIFY_PRETTYPRINT_REGULAR'] = False
+app.config['JSON_SORT_KEYS'] = False
+
+RESULTS_PATH = "./aggregate_results.json"
+RESULTS_BIN_PATH = "./aggregate_results.bin"
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_cache = {'mtime': 0, 'data': None}
+_cache_lock = threading.Lock()
+_server_blobs = {'mtime': 0, 'blobs': {}}
+
 
 def read_results():
     """
     Зчитує результати перевірок з файлу aggregate_results.json.
 
+    Розпарсені дані кешуються в пам'яті за mtime файлу, тому повторні
+    запити між циклами моніторингу не читають диск і не парсять JSON.
+
     Повертає:
     - dict: Дані з файлу у вигляді словника.
     """
-    with open("./aggregate_results.json", "r") as file:
-        data = json.load(file)
-    return data
+    mtime = os.stat(RESULTS_PATH).st_mtime_ns
+    if mtime != _cache['mtime']:
+        with _cache_lock:
+            if mtime != _cache['mtime']:
+                with open(RESULTS_PATH, "rb") as file:
+                    _cache['data'] = orjson.loads(file.read())
+                _cache['mtime'] = mtime
+    return _cache['data']
 
 @app.route('/results', methods=['GET'])
 def get_results():
     """
     Обробляє GET-запит для отримання всіх результатів перевірок.
 
+    Віддає готовий байтовий знімок, записаний монітором у
+    aggregate_results.bin, без парсингу та повторної серіалізації.
+    Знімок передається частинами, тому пам'ять на запит обмежена
+    розміром одного фрагмента незалежно від розміру результатів.
+
     Повертає:
-    - jsonify: Всі результати перевірок у форматі JSON.
+    - Response: Всі результати перевірок у форматі JSON.
     """
-    data = read_results()
-    return jsonify(data)
+    try:
+        file = open(RESULTS_BIN_PATH, "rb")
+    except FileNotFoundError:
+        return jsonify({"error": "Results are not available yet"}), 503
+
+    def generate():
+        with file:
+            while chunk := file.read(STREAM_CHUNK_SIZE):
+                yield chunk
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
 
 @app.route('/results/<server_name>', methods=['GET'])
 def get_server_results(server_name):
@@ -34,13 +87,25 @@ def get_server_results(server_name):
     - server_name: Назва сервера.
 
     Повертає:
-    - jsonify: Результати перевірок для вказаного сервера у форматі JSON або повідомлення про помилку.
+    - Response: Результати перевірок для вказаного сервера у форматі JSON або повідомлення про помилку.
     """
-    data = read_results()
-    server_data = data.get(server_name, {})
-    if not server_data:
-        return jsonify({"error": "Server not found"}), 404
-    return jsonify(server_data)
+    read_results()
+    with _cache_lock:
+        mtime = _cache['mtime']
+        server_data = _cache['data'].get(server_name, {})
+        if not server_data:
+            return jsonify({"error": "Server not found"}), 404
+        if mtime != _server_blobs['mtime']:
+            _server_blobs['blobs'] = {}
+            _server_blobs['mtime'] = mtime
+        blob = _server_blobs['blobs'].get(server_name)
+        if blob is None:
+            blob = orjson.dumps(server_data)
+            _server_blobs['blobs'][server_name] = blob
+    return Response(blob, mimetype='application/json')
 
+# У продакшені застосунок запускається через WSGI-сервер з кількома воркерами:
+#   gunicorn -w 4 -k gthread --threads 8 -b 206.54.170.102:5000 api:app
+# Вбудований сервер Werkzeug нижче — лише для локальної розробки.
 if __name__ == "__main__":
-    app.run(debug=True, host='206.54.170.102', port=5000)
+    app.run(debug=False, threaded=True, host='206.54.170.102', port=5000)
@@ -1,3 +1,4 @@
+import asyncio
 from aiohttp import web
 from telegram import Bot
 import os
@@ -11,6 +12,9 @@ async def handle_alert(request):
     """
     Обробляє HTTP POST запити для відправки повідомлень через Telegram бота.
 
+    Приймає список 'chat_ids' і розсилає повідомлення всім чатам за один
+    запит; поле 'chat_id' підтримується для сумісності.
+
     Аргументи:
     - request: Запит, отриманий від клієнта.
 
@@ -18,12 +22,14 @@ async def handle_alert(request):
     - web.Response: Відповідь з кодом статусу.
     """
     data = await request.json()
-    chat_id = data.get('chat_id')
+    chat_ids = data.get('chat_ids')
+    if chat_ids is None and data.get('chat_id'):
+        chat_ids = [data['chat_id']]
     message = data.get('message')
-    if not chat_id or not message:
-        return web.Response(status=400, text="Bad request: 'chat_id' and 'message' fields are required.")
+    if not chat_ids or not message:
+        return web.Response(status=400, text="Bad request: 'chat_ids' and 'message' fields are required.")
     try:
-        await bot.send_message(chat_id=chat_id, text=message)
+        await asyncio.gather(*(bot.send_message(chat_id=chat_id, text=message) for chat_id in chat_ids))
         return web.Response(status=200, text="Message sent successfully.")
     except Exception as e:
         return web.Response(status=500, text=str(e))
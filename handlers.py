@@ -1,8 +1,65 @@
 import requests
 from config import chats
-import paramiko
 import logging
+import threading
 from config import servers
+from ssh_pool import get_ssh
+
+ALERT_URL = 'http://127.0.0.1:5001/alert'
+
+_session_lock = threading.Lock()
+
+
+def _make_session():
+    """
+    Створює сесію requests з пулом з'єднань до сервера сповіщень.
+
+    Повертає:
+    - requests.Session: Сесія з примонтованим HTTPAdapter.
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=50, pool_maxsize=100)
+    session.mount('http://', adapter)
+    return session
+
+
+_session = _make_session()
+
+
+def _post_alert(data):
+    """
+    Відправляє сповіщення через спільну сесію з пулом з'єднань.
+
+    При ConnectionError (застаріле з'єднання в пулі) пересоздає сесію
+    та повторює запит один раз.
+
+    Аргументи:
+    - data: Тіло POST-запиту до сервера сповіщень.
+    """
+    global _session
+    try:
+        _session.post(ALERT_URL, json=data, timeout=5)
+    except requests.exceptions.ConnectionError as e:
+        logging.error(f"Alert connection failed, rebuilding session: {e}")
+        with _session_lock:
+            _session = _make_session()
+        _session.post(ALERT_URL, json=data, timeout=5)
+
+
+def _broadcast(message):
+    """
+    Відправляє повідомлення до всіх чатів одним запитом.
+
+    Сервер сповіщень приймає список chat_ids і розсилає повідомлення
+    сам, тому розсилка коштує один HTTP-запит незалежно від кількості
+    чатів.
+
+    Аргументи:
+    - message: Текст повідомлення.
+    """
+    if not chats:
+        return
+    _post_alert({'chat_ids': list(chats), 'message': message})
 
 
 class FailureHandlingStrategy:
@@ -71,13 +128,7 @@ class NotifyFailureStrategy(FailureHandlingStrategy):
         - server_name: Назва сервера.
         - check_name: Назва перевірки.
         """
-        url = 'http://127.0.0.1:5001/alert'
-        for id in chats:
-            data = {
-                'chat_id': id,
-                'message': f'❗❗❗ТРИВОГА\n\n{server_name}: {check_name} НЕ ВІДПОВІДАЄ'
-            }
-            response = requests.post(url, json=data)
+        _broadcast(f'❗❗❗ТРИВОГА\n\n{server_name}: {check_name} НЕ ВІДПОВІДАЄ')
 
 
 class NotifyWarningStrategy(FailureHandlingStrategy):
@@ -97,13 +148,7 @@ class NotifyWarningStrategy(FailureHandlingStrategy):
         - check_name: Назва перевірки.
         - value: Значення попередження.
         """
-        url = 'http://127.0.0.1:5001/alert'
-        for id in chats:
-            data = {
-                'chat_id': id,
-                'message': f'⚠️УВАГА\n\n{server_name}: {check_name} = {value}'
-            }
-            response = requests.post(url, json=data)
+        _broadcast(f'⚠️УВАГА\n\n{server_name}: {check_name} = {value}')
 
 
 class MoveServicesStrategy(FailureHandlingStrategy):
@@ -152,7 +197,6 @@ class MoveServicesStrategy(FailureHandlingStrategy):
             ssh = self.connect_ssh(server_info)
             if ssh:
                 self.disable_services(ssh, server_info)
-                ssh.close()
                 return True
         except Exception as e:
             logging.error(f"Error disabling services on {server_info['name']}: {e}")
@@ -173,7 +217,6 @@ class MoveServicesStrategy(FailureHandlingStrategy):
             ssh = self.connect_ssh(server_info)
             if ssh:
                 self.enable_services(ssh, services)
-                ssh.close()
                 return True
         except Exception as e:
             logging.error(f"Error enabling services on {server_info['name']}: {e}")
@@ -190,14 +233,12 @@ class MoveServicesStrategy(FailureHandlingStrategy):
         - paramiko.SSHClient: Об'єкт SSHClient, якщо підключення успішне, інакше None.
         """
         try:
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            ssh.connect(
-                hostname=server_info['host'],
-                username=server_info['user'],
-                password=server_info['password']
+            return get_ssh(
+                server_info['host'],
+                22,
+                server_info['user'],
+                server_info['password']
             )
-            return ssh
         except Exception as e:
             logging.error(f"Failed to connect to {server_info['name']} via SSH: {e}")
             return None
@@ -254,10 +295,4 @@ class MoveServicesStrategy(FailureHandlingStrategy):
         Аргументи:
         - message: Текст повідомлення.
         """
-        url = 'http://127.0.0.1:5001/alert'
-        for id in chats:
-            data = {
-                'chat_id': id,
-                'message': message
-            }
-            response = requests.post(url, json=data)
+        _broadcast(message)
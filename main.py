@@ -1,15 +1,24 @@
 #!/usr/bin/python3
 
 from abc import ABC, abstractmethod
+import asyncio
 import subprocess
 import psutil
-import telnetlib
+import re
+import socket
 import time
-import paramiko
 from config import servers, resourse_limits, response_time_limit
-from threading import Thread
+from ssh_pool import get_ssh
+
+try:
+    from icmplib import ping as icmp_ping, ICMPLibError
+except ImportError:
+    icmp_ping = None
+    ICMPLibError = None
+from concurrent.futures import ThreadPoolExecutor
 import logging
-import json
+import orjson
+import os
 from datetime import datetime
 from handlers import StrategyFactory
 
@@ -21,6 +30,7 @@ class IMonitorStrategy(ABC):
     Методи:
     - check: Перевіряє стан сервера.
     - response_time: Повертає час відгуку сервера.
+    - measure: Повертає результат перевірки та час відгуку за один прохід.
     """
 
     @abstractmethod
@@ -31,11 +41,30 @@ class IMonitorStrategy(ABC):
     def response_time(self) -> float:
         pass
 
+    def measure(self) -> tuple:
+        """
+        Виконує перевірку та вимірювання часу відгуку.
+
+        Стратегії, для яких обидва значення доступні з одного виклику,
+        перевизначають цей метод, щоб не виконувати перевірку двічі.
+
+        Повертає:
+        - tuple: (bool: результат перевірки, float: час відгуку).
+        """
+        return self.check(), self.response_time()
+
+
+_PING_RE = re.compile(rb'time=([\d.]+)')
+
 
 class ServerPingMonitor(IMonitorStrategy):
     """
     Клас для моніторингу сервера за допомогою ping.
 
+    Використовує ICMP-сокет через icmplib (без fork/exec на кожну
+    перевірку), а за його відсутності — одну команду ping, з якої
+    бере і доступність, і час відгуку.
+
     Аргументи:
     - host: Адреса хоста для моніторингу.
     """
@@ -45,13 +74,12 @@ class ServerPingMonitor(IMonitorStrategy):
 
     def check(self) -> bool:
         """
-        Перевіряє доступність хоста за допомогою команди ping.
+        Перевіряє доступність хоста за допомогою ping.
 
         Повертає:
         - bool: True, якщо хост доступний, інакше False.
         """
-        response = subprocess.run(['ping', '-c', '1', self.host], stdout=subprocess.PIPE)
-        return response.returncode == 0
+        return self.measure()[0]
 
     def response_time(self) -> float:
         """
@@ -60,19 +88,42 @@ class ServerPingMonitor(IMonitorStrategy):
         Повертає:
         - float: Час відгуку в мілісекундах або -1.0, якщо не вдалося визначити.
         """
+        return self.measure()[1]
+
+    def measure(self) -> tuple:
+        """
+        Виконує одну перевірку ping, що повертає і доступність, і час відгуку.
+
+        Повертає:
+        - tuple: (bool: хост доступний, float: час відгуку в мілісекундах).
+        """
+        if icmp_ping is not None:
+            try:
+                result = icmp_ping(self.host, count=1, timeout=1, privileged=False)
+                return result.is_alive, result.avg_rtt
+            except (OSError, ICMPLibError) as e:
+                logging.error(f"icmplib ping to {self.host} failed, falling back to subprocess: {e}")
+        return self._measure_subprocess()
+
+    def _measure_subprocess(self) -> tuple:
+        """
+        Резервна перевірка через команду ping, якщо icmplib недоступний.
+
+        Повертає:
+        - tuple: (bool: хост доступний, float: час відгуку в мілісекундах).
+        """
         response = subprocess.run(['ping', '-c', '1', self.host], stdout=subprocess.PIPE)
-        output = response.stdout.decode('cp1251')
-        time_pos = output.find('time=')
-        if time_pos != -1:
-            start = time_pos + 5
-            end = output.find(' ', start)
-            return float(output[start:end])
-        return -1.0
+        match = _PING_RE.search(response.stdout)
+        return response.returncode == 0, float(match.group(1)) if match else -1.0
 
 
 class TelnetMonitor(IMonitorStrategy):
     """
-    Клас для моніторингу сервера за допомогою Telnet.
+    Клас для моніторингу TCP-порту сервера.
+
+    Замість повної telnet-сесії (telnetlib застарів починаючи з
+    Python 3.11) відкривається одне TCP-з'єднання, час встановлення
+    якого і є часом відгуку.
 
     Аргументи:
     - host: Адреса хоста для моніторингу.
@@ -85,34 +136,37 @@ class TelnetMonitor(IMonitorStrategy):
 
     def check(self) -> bool:
         """
-        Перевіряє можливість підключення до хоста за допомогою Telnet.
+        Перевіряє можливість підключення до порту хоста.
 
         Повертає:
         - bool: True, якщо підключення вдалося, інакше False.
         """
-        try:
-            with telnetlib.Telnet(self.host, self.port, timeout=10) as tn:
-                return True
-        except Exception as e:
-            logging.error(f"Error connecting to {self.host}:{self.port}: {e}")
-            return False
+        return self.measure()[0]
 
     def response_time(self) -> float:
         """
-        Вимірює час відгуку хоста за допомогою Telnet.
+        Вимірює час встановлення з'єднання з портом хоста.
 
         Повертає:
-        - float: Час відгуку в секундах.
+        - float: Час відгуку в секундах або -1.0, якщо підключення не вдалося.
+        """
+        return self.measure()[1]
+
+    def measure(self) -> tuple:
         """
+        Виконує одне TCP-підключення, що повертає і доступність, і час відгуку.
+
+        Повертає:
+        - tuple: (bool: порт приймає з'єднання, float: час підключення в секундах).
+        """
+        start_time = time.perf_counter()
         try:
-            start_time = time.time()
-            with telnetlib.Telnet(self.host, self.port, timeout=10) as tn:
-                end_time = time.time()
-                return end_time - start_time
-        except Exception as e:
-            end_time = time.time()
-            logging.error(f"Failed to connect to {self.host}:{self.port}: {e}")
-            return end_time - start_time
+            sock = socket.create_connection((self.host, self.port), timeout=10)
+            sock.close()
+            return True, time.perf_counter() - start_time
+        except OSError as e:
+            logging.error(f"Error connecting to {self.host}:{self.port}: {e}")
+            return False, -1.0
 
 
 class ServiceMonitor(IMonitorStrategy):
@@ -143,12 +197,9 @@ class ServiceMonitor(IMonitorStrategy):
         """
         command = f"systemctl is-active {self.service_name}"
         try:
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            ssh.connect(self.hostname, port=self.port, username=self.username, password=self.password)
+            ssh = get_ssh(self.hostname, self.port, self.username, self.password)
             stdin, stdout, stderr = ssh.exec_command(command)
             output = stdout.read().decode().strip()
-            ssh.close()
 
             return output == 'active'
         except Exception as e:
@@ -168,8 +219,17 @@ class ServiceMonitor(IMonitorStrategy):
 class CPUMonitor(IMonitorStrategy):
     """
     Клас для моніторингу завантаження CPU.
+
+    Показник процес-глобальний, тому вимірюється один раз за цикл
+    у CheckManager і передається сюди готовим значенням.
+
+    Аргументи:
+    - cpu_percent: Завантаження CPU у відсотках.
     """
 
+    def __init__(self, cpu_percent):
+        self.cpu_percent = cpu_percent
+
     def check(self) -> bool:
         """
         Завжди повертає True, оскільки перевірка завантаження CPU не залежить від доступності сервера.
@@ -181,21 +241,28 @@ class CPUMonitor(IMonitorStrategy):
 
     def response_time(self) -> float:
         """
-        Вимірює завантаження CPU у відсотках.
+        Повертає завантаження CPU у відсотках.
 
         Повертає:
         - float: Завантаження CPU у відсотках.
         """
-        load1, _, _ = psutil.getloadavg()
-        cpu_usage = (load1 / psutil.cpu_count()) * 100
-        return cpu_usage
+        return self.cpu_percent
 
 
 class RAMMonitor(IMonitorStrategy):
     """
     Клас для моніторингу використання оперативної пам'яті.
+
+    Показник процес-глобальний, тому вимірюється один раз за цикл
+    у CheckManager і передається сюди готовим значенням.
+
+    Аргументи:
+    - ram_percent: Використання оперативної пам'яті у відсотках.
     """
 
+    def __init__(self, ram_percent):
+        self.ram_percent = ram_percent
+
     def check(self) -> bool:
         """
         Завжди повертає True, оскільки перевірка використання оперативної пам'яті не залежить від доступності сервера.
@@ -207,13 +274,12 @@ class RAMMonitor(IMonitorStrategy):
 
     def response_time(self) -> float:
         """
-        Вимірює використання оперативної пам'яті у відсотках.
+        Повертає використання оперативної пам'яті у відсотках.
 
         Повертає:
         - float: Використання оперативної пам'яті у відсотках.
         """
-        mem = psutil.virtual_memory()
-        return mem.percent
+        return self.ram_percent
 
 
 class DiskMonitor(IMonitorStrategy):
@@ -247,6 +313,18 @@ class DiskMonitor(IMonitorStrategy):
         return usage.percent
 
 
+_RESOURCE_CHECKS = frozenset({'cpu', 'ram', 'disk_space'})
+
+MONITOR_FACTORY = {
+    'ping': lambda manager, server, check: ServerPingMonitor(server['host']),
+    'telnet': lambda manager, server, check: TelnetMonitor(server['host'], check['port']),
+    'service': lambda manager, server, check: ServiceMonitor(server['host'], 22, server['user'], server['password'], check['service']),
+    'cpu': lambda manager, server, check: CPUMonitor(manager.cpu_percent),
+    'ram': lambda manager, server, check: RAMMonitor(manager.ram_percent),
+    'disk_space': lambda manager, server, check: DiskMonitor(),
+}
+
+
 class CheckManager:
     """
     Клас для керування перевірками серверів.
@@ -254,14 +332,26 @@ class CheckManager:
     Атрибути:
     - handlers: Фабрика стратегій для обробки результатів перевірок.
     - aggregate_results: Зібрані результати перевірок.
-    - threads: Список потоків для паралельного виконання перевірок.
+    - pool: Постійний пул потоків для паралельного виконання перевірок.
     """
 
     def __init__(self):
         logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
         self.handlers = StrategyFactory()
         self.aggregate_results = {}
-        self.threads = []
+        self.pool = ThreadPoolExecutor(max_workers=min(32, sum(len(server['checks']) for server in servers)))
+        self.cpu_percent = 0.0
+        self.ram_percent = 0.0
+        self._loggers = {}
+        for server in servers:
+            name = server['name']
+            logger = logging.getLogger(name)
+            if not logger.handlers:
+                handler = logging.FileHandler(f"logs/{name}_checks.log")
+                handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s', '%Y-%m-%d %H:%M:%S'))
+                logger.addHandler(handler)
+                logger.propagate = False
+            self._loggers[name] = logger
 
     def run_check(self, server, check):
         """
@@ -271,33 +361,21 @@ class CheckManager:
         - server: Словник з даними про сервер.
         - check: Словник з даними про перевірку.
         """
-        host = server.get("host")
         check_name = check.get("name")
         try:
-            if check['type'] == 'ping':
-                monitor = ServerPingMonitor(host)
-            elif check['type'] == 'telnet':
-                monitor = TelnetMonitor(host, check['port'])
-            elif check['type'] == 'service':
-                monitor = ServiceMonitor(host, 22, server['user'], server['password'], check['service'])
-            elif check['type'] == 'cpu':
-                monitor = CPUMonitor()
-            elif check['type'] == 'ram':
-                monitor = RAMMonitor()
-            elif check['type'] == 'disk_space':
-                monitor = DiskMonitor()
-            else:
+            factory = MONITOR_FACTORY.get(check['type'])
+            if factory is None:
                 return
+            monitor = factory(self, server, check)
 
-            result = monitor.check()
-            response_time = monitor.response_time()
+            result, response_time = monitor.measure()
             self.log_result(server["name"], check["name"], result, response_time)
-            if check['type'] not in 'cpu ram disk_space':
+            if check['type'] not in _RESOURCE_CHECKS:
                 if not result:
                     self.handle_failure(server["name"], check["name"], check['type'])
                 elif response_time >= response_time_limit:
                     self.handle_warning(server["name"], check["name"], response_time)
-            elif check['type'] in 'cpu ram disk_space' and response_time >= resourse_limits[check_name]:
+            elif response_time >= resourse_limits[check_name]:
                 self.handle_warning(server["name"], check["name"], response_time)
         except Exception as e:
             logging.error(e)
@@ -312,11 +390,7 @@ class CheckManager:
         - result: Результат перевірки.
         - response_time: Час відгуку (за замовчуванням None).
         """
-        logger = logging.getLogger(server_name)
-        if not logger.handlers:
-            handler = logging.FileHandler(f"logs/{server_name}_checks.log")
-            handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s', '%Y-%m-%d %H:%М:%S'))
-            logger.addHandler(handler)
+        logger = self._loggers[server_name]
 
         if (check_name in ["CPU", "RAM", "DISK SPACE"]):
             logger.info(
@@ -325,12 +399,11 @@ class CheckManager:
             logger.info(
                 f"{server_name} --- {check_name} --- {'Success' if result else 'Failure'} | {f' Response Time: {round(response_time, 3)} seconds' if response_time is not None else ''}")
         if server_name not in self.aggregate_results:
-            self.aggregate_results[server_name] = []
-        self.aggregate_results[server_name].append({
-            "check_name": check_name,
-            "result": 'Success' if result else 'Failure',
-            "response_time": round(response_time, 3) if response_time is not None else None,
-        })
+            self.aggregate_results[server_name] = {'check_name': [], 'result': [], 'response_time': []}
+        columns = self.aggregate_results[server_name]
+        columns['check_name'].append(check_name)
+        columns['result'].append('Success' if result else 'Failure')
+        columns['response_time'].append(round(response_time, 3) if response_time is not None else None)
 
     def handle_failure(self, server_name, check_name, check_type):
         """
@@ -341,9 +414,7 @@ class CheckManager:
         - check_name: Назва перевірки.
         - check_type: Тип перевірки.
         """
-        with open('./aggregate_results.json', 'r') as file:
-            data = json.load(file)
-        handler = self.handlers.get_strategy(server_name, check_type, data)
+        handler = self.handlers.get_strategy(server_name, check_type, None)
         handler.handle(server_name, check_name)
 
     def handle_warning(self, server_name, check_name, value):
@@ -358,32 +429,79 @@ class CheckManager:
         handler = self.handlers.get_strategy(server_name, check_name, 'warning')
         handler.handle(server_name, check_name, value)
 
+    def _to_records(self):
+        """
+        Перетворює стовпчикові результати у список словників для JSON.
+
+        Результати зберігаються в пам'яті паралельними списками, щоб не
+        створювати словник на кожну перевірку; зовнішня схема JSON
+        (список записів на сервер) збирається лише під час серіалізації.
+
+        Повертає:
+        - dict: Результати перевірок у вигляді списків записів по серверах.
+        """
+        records = {}
+        for server_name, columns in self.aggregate_results.items():
+            records[server_name] = [
+                {"check_name": name, "result": result, "response_time": response_time}
+                for name, result, response_time
+                in zip(columns['check_name'], columns['result'], columns['response_time'])
+            ]
+        return records
+
     def save_aggregate_results(self):
         """
         Зберігає зібрані результати перевірок у файл.
+
+        Серіалізує результати один раз за цикл і атомарно (через os.replace)
+        записує їх у aggregate_results.json, а також публікує готовий
+        байтовий знімок у aggregate_results.bin, який api.py віддає
+        клієнтам без повторного парсингу та серіалізації.
         """
-        self.aggregate_results['last-check-time'] = datetime.now().strftime('%Y-%м-%д %H:%M:%S')
-        with open("./aggregate_results.json", "w") as json_file:
-            json_str = json.dumps(self.aggregate_results, indent=4)
-            json_file.write(json_str)
+        results = self._to_records()
+        results['last-check-time'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        blob = orjson.dumps(results)
+        tmp_path = "./aggregate_results.json.tmp"
+        with open(tmp_path, "wb") as json_file:
+            json_file.write(blob)
+        os.replace(tmp_path, "./aggregate_results.json")
+        bin_tmp_path = "./aggregate_results.bin.tmp"
+        with open(bin_tmp_path, "wb") as bin_file:
+            bin_file.write(blob)
+        os.replace(bin_tmp_path, "./aggregate_results.bin")
 
-    def start(self):
+    async def _run_cycle(self):
         """
-        Запускає процес моніторингу серверів у циклі.
+        Конкурентно виконує всі перевірки одного циклу моніторингу.
+
+        Перевірки виконуються в пулі потоків і збираються через
+        asyncio.gather, тому тривалість циклу наближається до найповільнішої
+        окремої перевірки.
         """
-        while True:
-            for server in servers:
-                for check in server['checks']:
-                    thread = Thread(target=self.run_check, args=(server, check,))
-                    self.threads.append(thread)
-                    thread.start()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[
+            loop.run_in_executor(self.pool, self.run_check, server, check)
+            for server in servers
+            for check in server['checks']
+        ])
 
-            for thread in self.threads:
-                thread.join()
+    async def _start(self):
+        """
+        Цикл моніторингу на asyncio.
+        """
+        while True:
+            self.cpu_percent = psutil.cpu_percent(interval=None)
+            self.ram_percent = psutil.virtual_memory().percent
+            await self._run_cycle()
 
             self.save_aggregate_results()
-            self.threads = []
-            time.sleep(60)
+            await asyncio.sleep(60)
+
+    def start(self):
+        """
+        Запускає процес моніторингу серверів у циклі.
+        """
+        asyncio.run(self._start())
 
 
 def start_monitoring():
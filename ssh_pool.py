@@ -0,0 +1,63 @@
+import threading
+import paramiko
+
+CONNECT_TIMEOUT = 10
+
+_ssh_pool = {}
+_host_locks = {}
+_locks_lock = threading.Lock()
+
+
+def _host_lock(host):
+    """
+    Повертає блокування для вказаного хоста.
+
+    Глобальне блокування тримається лише на час доступу до словника:
+    підключення до різних хостів відбуваються паралельно, тому завислий
+    connect до одного хоста не блокує перевірки інших.
+
+    Аргументи:
+    - host: Адреса хоста.
+
+    Повертає:
+    - threading.Lock: Блокування для хоста.
+    """
+    with _locks_lock:
+        lock = _host_locks.get(host)
+        if lock is None:
+            lock = threading.Lock()
+            _host_locks[host] = lock
+        return lock
+
+
+def get_ssh(host, port, username, password):
+    """
+    Повертає кешований SSH-клієнт для вказаного хоста.
+
+    Встановлення SSH-з'єднання (TCP + обмін ключами + автентифікація)
+    займає сотні мілісекунд, тому клієнти кешуються по хосту та
+    перевикористовуються для кількох команд. Якщо транспорт неактивний,
+    з'єднання встановлюється заново.
+
+    Аргументи:
+    - host: Адреса хоста для підключення.
+    - port: Порт для підключення.
+    - username: Ім'я користувача для підключення.
+    - password: Пароль для підключення.
+
+    Повертає:
+    - paramiko.SSHClient: Активний SSH-клієнт.
+    """
+    with _host_lock(host):
+        client = _ssh_pool.get(host)
+        if client is not None:
+            transport = client.get_transport()
+            if transport is not None and transport.is_active():
+                return client
+            client.close()
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        client.connect(host, port=port, username=username, password=password, timeout=CONNECT_TIMEOUT)
+        client.get_transport().set_keepalive(30)
+        _ssh_pool[host] = client
+        return client